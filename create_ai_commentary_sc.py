@@ -1,5 +1,6 @@
 from agentmake.plugins.chinese.convert_tc import convert_traditional_chinese
-import os, apsw, sqlite3
+import os, apsw, sqlite3, sys
+from revisions import initialize_revisions, record_revision, fetch_changed_since, parse_since
 
 
 DATABASE_NAME = 'ai_commentary_sc.db'
@@ -27,6 +28,7 @@ def initialize_db(db_name=DATABASE_NAME):
         # Execute the table creation command
         cursor.execute(create_table_sql)
         conn.commit()
+        initialize_revisions(conn)
         
         print(f"Database '{db_name}' initialized successfully.")
         return conn
@@ -34,6 +36,24 @@ def initialize_db(db_name=DATABASE_NAME):
         print(f"An error occurred during database initialization: {e}")
         return None
 
+def entry_exists(conn, book, chapter, verse):
+    """
+    Check if an entity exists in the Commentary table.
+    """
+    if conn is None:
+        print("Cannot check: Database connection is not established.")
+        return False
+
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM Commentary WHERE Book=? AND Chapter=? AND Verse=?", (book, chapter, verse))
+        fetch = cursor.fetchone()
+        if fetch:
+            return True
+    except sqlite3.Error as e:
+        print(f"An error occurred during insertion: {e}")
+    return False
+
 def insert_commentary(conn, book, chapter, verse, content, update=False):
     """
     Inserts a new entry into the Commentary table.
@@ -64,6 +84,8 @@ def insert_commentary(conn, book, chapter, verse, content, update=False):
             VALUES (?, ?, ?, ?);
             """
             cursor.execute(insert_sql, (book, chapter, verse, content))
+        # keep prior versions of the content, see revisions.py
+        record_revision(conn, book, chapter, verse, content)
 
         conn.commit()
         print(f"{'Updated' if update else 'Inserted'}: Book={book}, Chapter={chapter}, verse={verse}")
@@ -71,21 +93,38 @@ def insert_commentary(conn, book, chapter, verse, content, update=False):
     except sqlite3.Error as e:
         print(f"An error occurred during insertion: {e}")
 
-def fetch_zh_commentaries():
+def fetch_zh_commentaries(since=None):
+    """Fetches all Traditional Chinese commentaries, or only those revised at or after `since` if given."""
     db = os.path.join(os.getcwd(), "ai_commentary_zh.db")
+    if not os.path.isfile(db):
+        sys.exit(f"Database '{db}' not found.")
     with apsw.Connection(db) as connn:
         cursor = connn.cursor()
+        if since:
+            # revisions are set up by the zh pipeline, see create_ai_commentary_zh.py
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='Revision'")
+            if not cursor.fetchone():
+                sys.exit(f"No revisions in '{db}': run create_ai_commentary_zh.py on it first to set them up.")
+            return fetch_changed_since(connn, since)
         cursor.execute("SELECT * FROM Commentary")
         fetches = cursor.fetchall()
     return fetches
 
 if __name__ == '__main__':
+    # optional argument, e.g. '2025-01-31': convert only verses revised since then (UTC)
+    since = None
+    if len(sys.argv) > 1:
+        try:
+            since = parse_since(sys.argv[1])
+        except ValueError as e:
+            sys.exit(str(e))
+
     # 1. Initialize the database and get the connection object
     db_connection = initialize_db()
 
     if db_connection:
-        for b, c, v, content in fetch_zh_commentaries():
+        for b, c, v, content in fetch_zh_commentaries(since):
             print("Working on verse:", b, c, v)
             content_sc = convert_traditional_chinese(content, print_on_terminal=False)
-            insert_commentary(db_connection, b, c, v, content_sc, update=False)
+            insert_commentary(db_connection, b, c, v, content_sc, entry_exists(db_connection, b, c, v))
 
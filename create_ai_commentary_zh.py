@@ -3,6 +3,7 @@ import os, apsw, re
 from agentmake import agentmake
 from agentmake.plugins.uba.lib.BibleParser import BibleVerseParser
 from biblemate import AGENTMAKE_CONFIG
+from revisions import initialize_revisions, record_revision
 
 DATABASE_NAME = 'ai_commentary_zh.db'
 
@@ -32,6 +33,7 @@ def initialize_db(db_name=DATABASE_NAME):
         # Execute the table creation command
         cursor.execute(create_table_sql)
         conn.commit()
+        initialize_revisions(conn)
         
         print(f"Database '{db_name}' initialized successfully.")
         return conn
@@ -106,6 +108,8 @@ def insert_commentary(conn, book, chapter, verse, content, update=False):
             VALUES (?, ?, ?, ?);
             """
             cursor.execute(insert_sql, (book, chapter, verse, content))
+        # keep prior versions of the content, see revisions.py
+        record_revision(conn, book, chapter, verse, content)
 
         conn.commit()
         print(f"{'Updated' if update else 'Inserted'}: Book={book}, Chapter={chapter}, verse={verse}")
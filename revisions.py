@@ -0,0 +1,199 @@
+import sqlite3
+import argparse, difflib, hashlib, os
+from datetime import datetime
+
+# Timestamp given to revisions backfilled from rows that predate revision tracking,
+# so that they do not show up as changed in fetch_changed_since.
+BASELINE_TIMESTAMP = '1970-01-01 00:00:00'
+
+def content_hash(content):
+    """Returns the SHA-256 hex digest of a commentary text."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+def parse_since(since):
+    """
+    Normalises a timestamp such as '2025-01-31', '2025-1-5' or '2025-01-31T12:00' to the
+    'YYYY-MM-DD HH:MM:SS' format of the Timestamp column, so that it can be compared as a string.
+
+    Raises:
+        ValueError: If `since` is not a valid date or date-time.
+    """
+    try:
+        parsed = datetime.fromisoformat(since.strip())
+    except ValueError:
+        # fromisoformat does not accept dates without zero-padding, e.g. '2025-1-5'
+        try:
+            parsed = datetime.strptime(since.strip(), "%Y-%m-%d")
+        except ValueError:
+            raise ValueError(f"Invalid timestamp '{since}': expected e.g. '2025-01-31' or '2025-01-31 12:00:00' (UTC)") from None
+    if parsed.tzinfo is not None:
+        raise ValueError(f"Invalid timestamp '{since}': give a UTC time without a timezone offset")
+    return parsed.strftime("%Y-%m-%d %H:%M:%S")
+
+def initialize_revisions(conn):
+    """
+    Creates the 'Revision' table if it does not already exist and records the current
+    content of any Commentary row that has no revision yet, so that it is kept
+    when the row is overwritten later.
+
+    Where a verse has duplicate Commentary rows, the most recently inserted one
+    (highest rowid) is taken as its content, here and in fetch_changed_since.
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Revision (
+        Book INTEGER,
+        Chapter INTEGER,
+        Verse INTEGER,
+        Revision INTEGER,
+        Hash TEXT,
+        Timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+        Content TEXT
+    );
+    """)
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS Revision_BCVR ON Revision (Book, Chapter, Verse, Revision)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS Revision_Timestamp ON Revision (Timestamp)")
+    untracked = cursor.execute("""
+        SELECT Book, Chapter, Verse, Content, MAX(rowid) FROM Commentary c
+        WHERE NOT EXISTS (SELECT 1 FROM Revision r WHERE r.Book = c.Book AND r.Chapter = c.Chapter AND r.Verse = c.Verse)
+        GROUP BY Book, Chapter, Verse
+    """).fetchall()
+    cursor.executemany("""
+        INSERT INTO Revision (Book, Chapter, Verse, Revision, Hash, Timestamp, Content)
+        VALUES (?, ?, ?, 1, ?, ?, ?);
+    """, [(b, c, v, content_hash(content or ""), BASELINE_TIMESTAMP, content) for b, c, v, content, _ in untracked])
+    conn.commit()
+    if untracked:
+        print(f"Recorded baseline revisions: {len(untracked)}")
+
+def record_revision(conn, book, chapter, verse, content):
+    """
+    Appends a revision of a verse commentary, unless its content is unchanged from the latest revision.
+    The caller is responsible for committing.
+
+    Returns:
+        int | None: The new revision number, or None if the content is unchanged.
+    """
+    digest = content_hash(content or "")
+    cursor = conn.cursor()
+    cursor.execute("SELECT Revision, Hash FROM Revision WHERE Book=? AND Chapter=? AND Verse=? ORDER BY Revision DESC LIMIT 1", (book, chapter, verse))
+    latest = cursor.fetchone()
+    if latest and latest[1] == digest:
+        return None
+    revision = latest[0] + 1 if latest else 1
+    cursor.execute("""
+        INSERT INTO Revision (Book, Chapter, Verse, Revision, Hash, Content)
+        VALUES (?, ?, ?, ?, ?, ?);
+    """, (book, chapter, verse, revision, digest, content))
+    return revision
+
+def fetch_changed_since(conn, since):
+    """
+    Fetches the current Commentary rows of verses revised at or after a given time.
+
+    Args:
+        conn: The database connection object (sqlite3 or apsw).
+        since (str): UTC date or date-time, e.g. '2025-01-31' or '2025-01-31 12:00:00'; see parse_since.
+
+    Returns:
+        list: (Book, Chapter, Verse, Content) tuples, one per verse, in verse order.
+
+    Raises:
+        ValueError: If `since` is not a valid date or date-time.
+    """
+    since = parse_since(since)
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT Book, Chapter, Verse, Content, MAX(rowid) FROM Commentary c
+        WHERE EXISTS (SELECT 1 FROM Revision r WHERE r.Book = c.Book AND r.Chapter = c.Chapter AND r.Verse = c.Verse AND r.Timestamp >= ?)
+        GROUP BY Book, Chapter, Verse
+        ORDER BY Book, Chapter, Verse
+    """, (since,))
+    return [(b, c, v, content) for b, c, v, content, _ in cursor.fetchall()]
+
+def fetch_revisions(conn, book, chapter, verse):
+    """Fetches (Revision, Hash, Timestamp) of all revisions of a verse commentary, oldest first."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT Revision, Hash, Timestamp FROM Revision WHERE Book=? AND Chapter=? AND Verse=? ORDER BY Revision", (book, chapter, verse))
+    return cursor.fetchall()
+
+def fetch_revision_content(conn, book, chapter, verse, revision):
+    """Fetches the content of one revision of a verse commentary, or None if there is no such revision."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT Content FROM Revision WHERE Book=? AND Chapter=? AND Verse=? AND Revision=?", (book, chapter, verse, revision))
+    fetch = cursor.fetchone()
+    return fetch[0] if fetch else None
+
+def diff_revisions(conn, book, chapter, verse, old=None, new=None):
+    """
+    Returns a unified diff between two revisions of a verse commentary.
+    By default, the latest revision is compared with the one before it.
+
+    Raises:
+        ValueError: If `old` or `new` is not a revision of the verse.
+    """
+    revisions = [row[0] for row in fetch_revisions(conn, book, chapter, verse)]
+    for revision in (old, new):
+        if revision is not None and revision not in revisions:
+            raise ValueError(f"No revision {revision} of {book} {chapter}:{verse}; revisions: {', '.join(map(str, revisions)) or 'none'}")
+    if not revisions:
+        return ""
+    if new is None:
+        new = revisions[-1]
+    if old is None:
+        older = [r for r in revisions if r < new]
+        old = older[-1] if older else new
+    old_content = fetch_revision_content(conn, book, chapter, verse, old) or ""
+    new_content = fetch_revision_content(conn, book, chapter, verse, new) or ""
+    # compare lines without line endings, as stored content usually has no trailing newline
+    diff = difflib.unified_diff(
+        old_content.splitlines(),
+        new_content.splitlines(),
+        fromfile=f"{book}.{chapter}.{verse}@{old}",
+        tofile=f"{book}.{chapter}.{verse}@{new}",
+        lineterm="",
+    )
+    return "".join(line + "\n" for line in diff)
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description="Inspect revisions of commentary databases")
+    arg_parser.add_argument("database", help="e.g. ai_commentary.db")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+    changed = commands.add_parser("changed", help="list verses revised at or after a UTC timestamp")
+    changed.add_argument("since", help="e.g. '2025-01-31' or '2025-01-31 12:00:00'")
+    log = commands.add_parser("log", help="list revisions of a verse")
+    diff = commands.add_parser("diff", help="diff two revisions of a verse (default: latest against previous)")
+    for command in (log, diff):
+        command.add_argument("book", type=int)
+        command.add_argument("chapter", type=int)
+        command.add_argument("verse", type=int)
+    diff.add_argument("old", type=int, nargs="?")
+    diff.add_argument("new", type=int, nargs="?")
+    args = arg_parser.parse_args()
+    if args.command == "changed":
+        try:
+            since = parse_since(args.since)
+        except ValueError as e:
+            arg_parser.error(str(e))
+    if not os.path.isfile(args.database):
+        arg_parser.error(f"Database '{args.database}' not found.")
+
+    db_connection = sqlite3.connect(args.database)
+    try:
+        initialize_revisions(db_connection)
+    except sqlite3.Error as e:
+        db_connection.close()
+        arg_parser.error(f"Cannot set up revisions in '{args.database}': {e}")
+    if args.command == "changed":
+        for b, c, v, _ in fetch_changed_since(db_connection, since):
+            print(f"{b} {c}:{v}")
+    elif args.command == "log":
+        for revision, digest, timestamp in fetch_revisions(db_connection, args.book, args.chapter, args.verse):
+            print(f"{revision}\t{timestamp}\t{digest}")
+    else:
+        try:
+            print(diff_revisions(db_connection, args.book, args.chapter, args.verse, args.old, args.new), end="")
+        except ValueError as e:
+            db_connection.close()
+            arg_parser.error(str(e))
+    db_connection.close()